@@ -0,0 +1,32 @@
+"""Time UrlClassifier.classify over the test corpus.
+
+    python benchmarks/bench_url_classifier.py
+"""
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from url_classifier import UrlClassifier  # noqa: E402
+from test_url_classifier import load_corpus, make_classifier  # noqa: E402
+
+
+def main():
+    inputs = [text for text, _ in load_corpus()]
+
+    load_time = timeit.timeit(lambda: UrlClassifier().suffixes, number=10) / 10
+    print(f"public suffix list load: {load_time * 1000:.2f} ms")
+
+    classifier = make_classifier()
+    classifier.suffixes  # exclude the one-off lazy load from the timing
+    number = 2000
+    runs = timeit.repeat(lambda: [classifier.classify(text) for text in inputs], number=number, repeat=5)
+    per_call = min(runs) / (number * len(inputs))
+    print(f"classify: {per_call * 1e6:.2f} us per input ({len(inputs)} inputs, best of 5)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,1783 @@
 import sys
 import os
+import fnmatch
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from itertools import count
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from urllib.parse import urlsplit, parse_qsl
 from PyQt5.QtCore import *
 from PyQt5.QtWidgets import *
 from PyQt5.QtWebEngineWidgets import *
-from PyQt5.QtGui import QIcon, QKeySequence, QFont, QPalette, QColor
+from PyQt5.QtWebEngineCore import QWebEngineUrlRequestInterceptor, QWebEngineUrlRequestInfo
+from PyQt5.QtGui import QIcon, QKeySequence, QFont, QPalette, QColor, QPixmap
+from url_classifier import UrlClassifier
+
+
+# Injected at document creation: a PerformanceObserver queues every
+# resource entry, including ones past the 250-entry timing buffer and ones
+# loaded after the load event, until the browser collects them
+RESOURCE_TIMING_SCRIPT = """
+(function() {
+    if (window.__bathuResourceTiming || typeof PerformanceObserver === 'undefined') {
+        return;
+    }
+    var pending = [];
+    window.__bathuResourceTiming = function() {
+        var entries = pending;
+        pending = [];
+        return entries;
+    };
+    new PerformanceObserver(function(list) {
+        list.getEntries().forEach(function(e) {
+            pending.push({
+                url: e.name,
+                initiatorType: e.initiatorType,
+                duration: e.duration,
+                transferSize: e.transferSize || 0,
+                encodedBodySize: e.encodedBodySize || 0,
+                decodedBodySize: e.decodedBodySize || 0
+            });
+        });
+        // Pages nobody inspects must not grow this queue forever
+        if (pending.length > 2000) {
+            pending.splice(0, pending.length - 2000);
+        }
+    }).observe({type: 'resource', buffered: true});
+})();
+"""
+
+RESOURCE_TIMING_TAKE_JS = "window.__bathuResourceTiming ? window.__bathuResourceTiming() : []"
+
+RESOURCE_TYPE_NAMES = {
+    QWebEngineUrlRequestInfo.ResourceTypeMainFrame: "document",
+    QWebEngineUrlRequestInfo.ResourceTypeSubFrame: "subdocument",
+    QWebEngineUrlRequestInfo.ResourceTypeStylesheet: "stylesheet",
+    QWebEngineUrlRequestInfo.ResourceTypeScript: "script",
+    QWebEngineUrlRequestInfo.ResourceTypeImage: "image",
+    QWebEngineUrlRequestInfo.ResourceTypeFontResource: "font",
+    QWebEngineUrlRequestInfo.ResourceTypeSubResource: "other",
+    QWebEngineUrlRequestInfo.ResourceTypeObject: "object",
+    QWebEngineUrlRequestInfo.ResourceTypeMedia: "media",
+    QWebEngineUrlRequestInfo.ResourceTypeWorker: "worker",
+    QWebEngineUrlRequestInfo.ResourceTypeSharedWorker: "worker",
+    QWebEngineUrlRequestInfo.ResourceTypePrefetch: "prefetch",
+    QWebEngineUrlRequestInfo.ResourceTypeFavicon: "favicon",
+    QWebEngineUrlRequestInfo.ResourceTypeXhr: "xhr",
+    QWebEngineUrlRequestInfo.ResourceTypePing: "ping",
+    QWebEngineUrlRequestInfo.ResourceTypeServiceWorker: "worker",
+    QWebEngineUrlRequestInfo.ResourceTypeCspReport: "csp-report",
+    QWebEngineUrlRequestInfo.ResourceTypePluginResource: "plugin",
+}
+
+
+class RequestRingBuffer:
+    """Fixed-size log of network requests for one tab.
+
+    Old records are dropped once the buffer is full so long-lived pages
+    never grow without bound. The newest record per URL is indexed so
+    Resource Timing data can be merged in without scanning the buffer.
+    """
+
+    def __init__(self, capacity=2000):
+        self.capacity = capacity
+        self.records = deque(maxlen=capacity)
+        self.by_url = {}
+        self.total_appended = 0
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def append(self, record):
+        if len(self.records) == self.capacity:
+            dropped = self.records[0]
+            if self.by_url.get(dropped["url"]) is dropped:
+                del self.by_url[dropped["url"]]
+        self.records.append(record)
+        self.by_url[record["url"]] = record
+        self.total_appended += 1
+
+    def clear(self):
+        self.records.clear()
+        self.by_url.clear()
+
+    def merge_timing(self, entries):
+        """Attach Resource Timing entries to the matching request records"""
+        for entry in entries or []:
+            record = self.by_url.get(entry.get("url"))
+            if record is None or record["duration"] is not None:
+                continue
+            record["duration"] = entry.get("duration") or 0.0
+            record["transfer_size"] = int(entry.get("transferSize") or 0)
+            record["body_size"] = int(entry.get("encodedBodySize") or 0)
+            # Cross-origin responses without Timing-Allow-Origin report all sizes as 0
+            record["size_known"] = any(entry.get(key) for key in
+                                       ("transferSize", "encodedBodySize", "decodedBodySize"))
+            if not record["initiator"]:
+                record["initiator"] = entry.get("initiatorType") or ""
+
+    def heaviest_hosts(self, n=5):
+        """Return the top N hosts as (host, bytes or None, requests, load time in ms).
+
+        Hosts are ranked by total load time, which is reported for every
+        request; bytes are None when no response from the host exposed its size.
+        """
+        sizes = {}
+        counts = Counter()
+        durations = Counter()
+        for record in self.records:
+            host = record["host"]
+            counts[host] += 1
+            durations[host] += record["duration"] or 0.0
+            if record["size_known"]:
+                sizes[host] = sizes.get(host, 0) + record["transfer_size"]
+        ranked = sorted(counts, key=lambda host: (durations[host], counts[host]), reverse=True)
+        return [(host, sizes.get(host), counts[host], durations[host]) for host in ranked[:n]]
+
+    def to_har(self, browser_name, page_url="", page_title=""):
+        """Build a HAR 1.2 document from the recorded requests"""
+        started = self.records[0]["started"] if self.records else time.time()
+        page_id = "page_1"
+        entries = []
+        for record in self.records:
+            duration = record["duration"] or 0.0
+            parts = urlsplit(record["url"])
+            entries.append({
+                "pageref": page_id,
+                "startedDateTime": _iso_time(record["started"]),
+                "time": duration,
+                "request": {
+                    "method": record["method"],
+                    "url": record["url"],
+                    "httpVersion": "",
+                    "cookies": [],
+                    "headers": [],
+                    "queryString": [{"name": k, "value": v}
+                                    for k, v in parse_qsl(parts.query, keep_blank_values=True)],
+                    "headersSize": -1,
+                    "bodySize": -1,
+                },
+                "response": {
+                    "status": 0,
+                    "statusText": "Blocked" if record["blocked"] else "",
+                    "httpVersion": "",
+                    "cookies": [],
+                    "headers": [],
+                    "content": {"size": record["body_size"] if record["size_known"] else 0, "mimeType": ""},
+                    "redirectURL": "",
+                    "headersSize": -1,
+                    "bodySize": record["body_size"] if record["size_known"] else -1,
+                    "_transferSize": record["transfer_size"],
+                },
+                "cache": {},
+                "timings": {"send": 0, "wait": 0, "receive": duration},
+                "_resourceType": record["type"],
+                "_initiator": record["initiator"],
+                "_blocked": record["blocked"],
+            })
+
+        return {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": browser_name, "version": "1.0"},
+                "pages": [{
+                    "startedDateTime": _iso_time(started),
+                    "id": page_id,
+                    "title": page_title or page_url,
+                    "pageTimings": {},
+                }],
+                "entries": entries,
+            }
+        }
+
+
+def _iso_time(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="milliseconds")
+
+
+class NetworkRequestInterceptor(QWebEngineUrlRequestInterceptor):
+    """Profile-wide interceptor enforcing the user's block list.
+
+    interceptRequest runs on the network thread, so the block list is a
+    frozenset that is replaced, never mutated. Requests to a blocked host or
+    any of its subdomains are cancelled; the blocked/allowed status in the
+    network log only reflects this list.
+    """
+
+    _instance = None
+
+    def __init__(self, state_path=None, parent=None):
+        super().__init__(parent)
+        self.state_path = state_path
+        self.blocked_hosts = frozenset()
+        if state_path and os.path.exists(state_path):
+            try:
+                with open(state_path, encoding="utf-8") as f:
+                    self.blocked_hosts = frozenset(json.load(f))
+            except (OSError, ValueError):
+                pass
+
+    @classmethod
+    def instance(cls):
+        """Install the interceptor and the timing script on the default profile once"""
+        if cls._instance is None:
+            cls._instance = cls(get_data_path("blocked_hosts.json"))
+            profile = QWebEngineProfile.defaultProfile()
+            if hasattr(profile, "setUrlRequestInterceptor"):
+                profile.setUrlRequestInterceptor(cls._instance)
+            else:
+                profile.setRequestInterceptor(cls._instance)
+
+            script = QWebEngineScript()
+            script.setName("bathu-resource-timing")
+            script.setSourceCode(RESOURCE_TIMING_SCRIPT)
+            script.setInjectionPoint(QWebEngineScript.DocumentCreation)
+            script.setWorldId(QWebEngineScript.ApplicationWorld)
+            script.setRunsOnSubFrames(False)
+            profile.scripts().insert(script)
+        return cls._instance
+
+    def set_blocked_hosts(self, hosts):
+        self.blocked_hosts = frozenset(h.strip().lower() for h in hosts if h.strip())
+        if self.state_path:
+            try:
+                with open(self.state_path, "w", encoding="utf-8") as f:
+                    json.dump(sorted(self.blocked_hosts), f)
+            except OSError:
+                pass
+
+    def is_blocked(self, host):
+        blocked_hosts = self.blocked_hosts
+        if not blocked_hosts:
+            return False
+        labels = host.lower().split(".")
+        return any(".".join(labels[i:]) in blocked_hosts for i in range(len(labels)))
+
+    def interceptRequest(self, info):
+        if self.is_blocked(info.requestUrl().host()):
+            info.block(True)
+
+
+class PageRequestRecorder(QWebEngineUrlRequestInterceptor):
+    """Per-page interceptor that logs every request of one tab.
+
+    Page interceptors (Qt 5.13+) run on the GUI thread and only see their
+    own page's requests, so each record belongs to exactly one tab. Older
+    Qt versions have no page interceptors and keep an empty network log.
+    """
+
+    def __init__(self, tab):
+        super().__init__(tab)
+        self.tab = tab
+        self.blocker = NetworkRequestInterceptor.instance()
+
+    @staticmethod
+    def supported():
+        return hasattr(QWebEnginePage, "setUrlRequestInterceptor")
+
+    def interceptRequest(self, info):
+        url = info.requestUrl()
+        host = url.host()
+        blocked = self.blocker.is_blocked(host)
+        if blocked:
+            info.block(True)
+
+        initiator = info.initiator().toString() if hasattr(info, "initiator") else ""
+        self.tab.network_log.append({
+            "url": url.toString(),
+            "host": host,
+            "method": bytes(info.requestMethod()).decode("ascii", "replace"),
+            "type": RESOURCE_TYPE_NAMES.get(info.resourceType(), "other"),
+            "initiator": initiator,
+            "started": time.time(),
+            "duration": None,
+            "transfer_size": 0,
+            "body_size": 0,
+            "size_known": False,
+            "blocked": blocked,
+        })
+        self.tab.networkLogChanged.emit()
+
+
+class NetworkLogModel(QAbstractTableModel):
+    """Table model over a RequestRingBuffer.
+
+    sync() turns the records appended since the last call into row
+    insert/remove notifications, so the view only repaints visible rows and
+    the cost of a refresh does not grow with the size of the log.
+    """
+
+    COLUMNS = ["Type", "Host", "URL", "Initiator", "Time (ms)", "Size", "Status"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.log = None
+        self.rows = 0
+        self.synced_total = 0
+
+    def set_log(self, log):
+        self.beginResetModel()
+        self.log = log
+        self.rows = len(log) if log is not None else 0
+        self.synced_total = log.total_appended if log is not None else 0
+        self.endResetModel()
+
+    def sync(self):
+        log = self.log
+        if log is None:
+            return
+        appended = log.total_appended - self.synced_total
+        if appended > log.capacity or len(log) < self.rows:
+            self.set_log(log)
+            return
+
+        removed = self.rows + appended - len(log)
+        if removed > 0:
+            self.beginRemoveRows(QModelIndex(), 0, removed - 1)
+            self.rows -= removed
+            self.endRemoveRows()
+        if appended > 0:
+            self.beginInsertRows(QModelIndex(), self.rows, len(log) - 1)
+            self.rows = len(log)
+            self.endInsertRows()
+        self.synced_total = log.total_appended
+
+        # Resource Timing merges update sizes and durations in place
+        if self.rows:
+            self.dataChanged.emit(self.index(0, 4), self.index(self.rows - 1, 5), [Qt.DisplayRole])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or self.log is None:
+            return None
+        record = self.log[index.row()]
+        duration = record["duration"]
+        column = index.column()
+        if column == 0:
+            return record["type"]
+        if column == 1:
+            return record["host"]
+        if column == 2:
+            return record["url"]
+        if column == 3:
+            return record["initiator"]
+        if column == 4:
+            return f"{duration:.0f}" if duration is not None else ""
+        if column == 5:
+            return str(record["transfer_size"]) if duration is not None else ""
+        return "blocked" if record["blocked"] else "allowed"
+
+
+class NetworkInspector(QDockWidget):
+    """Dock listing the requests recorded for the current tab"""
+
+    def __init__(self, parent=None):
+        super().__init__("Network", parent)
+        self.setObjectName("NetworkInspector")
+        self.log = None
+
+        self.model = NetworkLogModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+
+        self.hosts_label = QLabel()
+        self.hosts_label.setWordWrap(True)
+
+        clear_btn = QPushButton("Clear")
+        clear_btn.clicked.connect(self.clear_log)
+        export_btn = QPushButton("Export HAR...")
+        export_btn.clicked.connect(lambda: parent.export_har() if parent else None)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.hosts_label, 1)
+        buttons.addWidget(clear_btn)
+        buttons.addWidget(export_btn)
+
+        container = QWidget()
+        layout = QVBoxLayout()
+        layout.setContentsMargins(5, 5, 5, 5)
+        layout.addLayout(buttons)
+        layout.addWidget(self.table)
+        container.setLayout(layout)
+        self.setWidget(container)
+
+        self.setStyleSheet("""
+            QDockWidget {
+                color: white;
+            }
+            QTableView {
+                background-color: #141414;
+                color: white;
+                gridline-color: #2D2D2D;
+                border: none;
+            }
+            QHeaderView::section {
+                background-color: #2D2D2D;
+                color: white;
+                border: none;
+                padding: 4px;
+            }
+            QPushButton {
+                background-color: #E50914;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                padding: 6px 12px;
+            }
+            QPushButton:hover {
+                background-color: #F40612;
+            }
+        """)
+
+        # Coalesce bursts of requests into one repaint
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(250)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def set_log(self, log):
+        self.log = log
+        self.model.set_log(log)
+        self.refresh()
+
+    def schedule_refresh(self):
+        if self.isVisible() and not self.refresh_timer.isActive():
+            self.refresh_timer.start()
+
+    def clear_log(self):
+        if self.log is not None:
+            self.log.clear()
+        self.model.set_log(self.log)
+        self.refresh()
+
+    def refresh(self):
+        self.model.sync()
+
+        if self.log is not None and len(self.log):
+            hosts = ", ".join(
+                f"{host} ({f'{size // 1024} KB' if size is not None else 'size unknown'}, "
+                f"{count} req, {duration:.0f} ms)"
+                for host, size, count, duration in self.log.heaviest_hosts(5))
+            self.hosts_label.setText(f"{len(self.log)} requests - Heaviest hosts: {hosts}")
+        else:
+            self.hosts_label.setText("No requests recorded")
+
+
+BAR_FOLDER_ID = 1
+OTHER_FOLDER_ID = 2
+
+# Seeded into a fresh bookmarks bar, same links as the home page
+DEFAULT_BOOKMARKS = [
+    ("Brave Search", "https://search.brave.com"),
+    ("Netflix", "https://www.netflix.com"),
+    ("YouTube", "https://www.youtube.com"),
+    ("GitHub", "https://www.github.com"),
+]
+
+
+def normalize_bookmark_url(url):
+    """Canonical form used for bookmark lookups (case-insensitive host, no fragment)"""
+    parts = urlsplit(url.strip())
+    path = parts.path if parts.path not in ("", "/") else ""
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}{path}" + (
+        f"?{parts.query}" if parts.query else "")
+
+
+def clean_tags(tags):
+    """Normalize user-entered tags: trimmed, lower case, no empties or duplicates"""
+    return sorted({tag.strip().lower() for tag in tags if tag.strip()})
+
+
+def get_data_path(filename):
+    """Return a path inside the per-user application data directory"""
+    data_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, filename)
+
+
+def open_bookmarks_db(path):
+    db = sqlite3.connect(path, timeout=30)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.executescript("""
+        CREATE TABLE IF NOT EXISTS folders (
+            id INTEGER PRIMARY KEY,
+            parent_id INTEGER,
+            title TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS bookmarks (
+            id INTEGER PRIMARY KEY,
+            folder_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            url TEXT NOT NULL,
+            normalized_url TEXT NOT NULL,
+            added REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS bookmark_tags (
+            tag TEXT NOT NULL,
+            bookmark_id INTEGER NOT NULL,
+            PRIMARY KEY (tag, bookmark_id)
+        );
+        CREATE INDEX IF NOT EXISTS bookmark_tags_bookmark ON bookmark_tags(bookmark_id);
+        CREATE INDEX IF NOT EXISTS bookmarks_folder ON bookmarks(folder_id);
+        CREATE INDEX IF NOT EXISTS bookmarks_url ON bookmarks(normalized_url);
+        CREATE INDEX IF NOT EXISTS folders_parent ON folders(parent_id);
+    """)
+    return db
+
+
+class BookmarkStore(QObject):
+    """Bookmarks, folders and tags persisted in SQLite.
+
+    Normalized URLs are also kept in an in-memory dict so the address bar
+    can check the star state on every urlChanged without a query.
+    """
+
+    changed = pyqtSignal()
+
+    _instance = None
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.db = open_bookmarks_db(path)
+        if self.db.execute("SELECT COUNT(*) FROM folders").fetchone()[0] == 0:
+            self.db.executemany("INSERT INTO folders (id, parent_id, title) VALUES (?, NULL, ?)",
+                                [(BAR_FOLDER_ID, "Bookmarks Bar"), (OTHER_FOLDER_ID, "Other Bookmarks")])
+            for title, url in DEFAULT_BOOKMARKS:
+                self._insert(BAR_FOLDER_ID, title, url)
+            self.db.commit()
+        self.url_index = {}
+        self.reload_index()
+
+    @classmethod
+    def instance(cls):
+        """Open the shared store used by every browser window"""
+        if cls._instance is None:
+            cls._instance = cls(get_data_path("bookmarks.db"))
+        return cls._instance
+
+    def reload_index(self):
+        self.url_index = {normalized: bookmark_id for bookmark_id, normalized in
+                          self.db.execute("SELECT id, normalized_url FROM bookmarks")}
+        self.changed.emit()
+
+    def _insert(self, folder_id, title, url, tags=()):
+        normalized = normalize_bookmark_url(url)
+        cursor = self.db.execute(
+            "INSERT INTO bookmarks (folder_id, title, url, normalized_url, added) "
+            "VALUES (?, ?, ?, ?, ?)", (folder_id, title or url, url, normalized, time.time()))
+        self.db.executemany("INSERT OR IGNORE INTO bookmark_tags (tag, bookmark_id) VALUES (?, ?)",
+                            [(tag, cursor.lastrowid) for tag in clean_tags(tags)])
+        return cursor.lastrowid, normalized
+
+    def is_bookmarked(self, url):
+        return normalize_bookmark_url(url) in self.url_index
+
+    def add_bookmark(self, url, title="", folder_id=BAR_FOLDER_ID, tags=()):
+        bookmark_id, normalized = self._insert(folder_id, title, url, tags)
+        self.db.commit()
+        self.url_index[normalized] = bookmark_id
+        self.changed.emit()
+        return bookmark_id
+
+    def remove_bookmark(self, url):
+        normalized = normalize_bookmark_url(url)
+        self.db.execute("DELETE FROM bookmark_tags WHERE bookmark_id IN "
+                        "(SELECT id FROM bookmarks WHERE normalized_url = ?)", (normalized,))
+        self.db.execute("DELETE FROM bookmarks WHERE normalized_url = ?", (normalized,))
+        self.db.commit()
+        self.url_index.pop(normalized, None)
+        self.changed.emit()
+
+    def set_tags(self, url, tags):
+        bookmark_id = self.url_index.get(normalize_bookmark_url(url))
+        if bookmark_id is None:
+            return
+        self.db.execute("DELETE FROM bookmark_tags WHERE bookmark_id = ?", (bookmark_id,))
+        self.db.executemany("INSERT OR IGNORE INTO bookmark_tags (tag, bookmark_id) VALUES (?, ?)",
+                            [(tag, bookmark_id) for tag in clean_tags(tags)])
+        self.db.commit()
+        self.changed.emit()
+
+    def get_tags(self, url):
+        bookmark_id = self.url_index.get(normalize_bookmark_url(url))
+        return [tag for (tag,) in self.db.execute(
+            "SELECT tag FROM bookmark_tags WHERE bookmark_id = ? ORDER BY tag", (bookmark_id,))]
+
+    def add_folder(self, title, parent_id=OTHER_FOLDER_ID):
+        cursor = self.db.execute("INSERT INTO folders (parent_id, title) VALUES (?, ?)",
+                                 (parent_id, title))
+        self.db.commit()
+        self.changed.emit()
+        return cursor.lastrowid
+
+    def folder_children(self, folder_id, limit=200):
+        """Return (subfolders, bookmarks) of a folder as (id, title) / (title, url) rows"""
+        folders = self.db.execute(
+            "SELECT id, title FROM folders WHERE parent_id = ? ORDER BY id LIMIT ?",
+            (folder_id, limit)).fetchall()
+        bookmarks = self.db.execute(
+            "SELECT title, url FROM bookmarks WHERE folder_id = ? ORDER BY id LIMIT ?",
+            (folder_id, limit)).fetchall()
+        return folders, bookmarks
+
+    def find_by_tag(self, tag, limit=200):
+        return self.db.execute(
+            "SELECT b.title, b.url FROM bookmark_tags t JOIN bookmarks b ON b.id = t.bookmark_id "
+            "WHERE t.tag = ? ORDER BY t.bookmark_id LIMIT ?", (tag.strip().lower(), limit)).fetchall()
+
+    def all_tags(self):
+        return [tag for (tag,) in self.db.execute("SELECT DISTINCT tag FROM bookmark_tags ORDER BY tag")]
+
+
+def iter_json_events(f, chunk_size=65536):
+    """Incrementally parse JSON from a text file, yielding (event, value) pairs.
+
+    Events are start_map, map_key, end_map, start_array, end_array and value.
+    Only the current chunk is held in memory, so huge documents stream through.
+    """
+    string_re = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+    scalar_re = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null')
+    buf = ""
+    pos = 0
+    eof = False
+    containers = []
+    expect_key = False
+
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,:":
+            pos += 1
+        if pos >= len(buf) or (not eof and len(buf) - pos < 64):
+            if eof:
+                if pos >= len(buf):
+                    return
+            else:
+                chunk = f.read(chunk_size)
+                buf = buf[pos:] + chunk
+                pos = 0
+                eof = not chunk
+                continue
+
+        ch = buf[pos]
+        if ch == "{":
+            containers.append("map")
+            expect_key = True
+            pos += 1
+            yield "start_map", None
+        elif ch == "[":
+            containers.append("array")
+            expect_key = False
+            pos += 1
+            yield "start_array", None
+        elif ch in "}]":
+            if not containers or containers[-1] != ("map" if ch == "}" else "array"):
+                raise ValueError(f"Unbalanced {ch!r} in JSON input")
+            containers.pop()
+            expect_key = bool(containers) and containers[-1] == "map"
+            pos += 1
+            yield ("end_map" if ch == "}" else "end_array"), None
+        elif ch == '"':
+            match = string_re.match(buf, pos)
+            if match is None:
+                if eof:
+                    raise ValueError("Unterminated string in JSON input")
+                # Grow geometrically so very long strings are not rescanned per chunk
+                chunk = f.read(max(chunk_size, len(buf) - pos))
+                buf = buf[pos:] + chunk
+                pos = 0
+                eof = not chunk
+                continue
+            pos = match.end()
+            value = json.loads(match.group())
+            if expect_key:
+                expect_key = False
+                yield "map_key", value
+            else:
+                expect_key = bool(containers) and containers[-1] == "map"
+                yield "value", value
+        else:
+            match = scalar_re.match(buf, pos)
+            if match is None:
+                raise ValueError(f"Unexpected character {ch!r} in JSON input")
+            pos = match.end()
+            expect_key = bool(containers) and containers[-1] == "map"
+            yield "value", json.loads(match.group())
+
+
+class NetscapeBookmarkParser(HTMLParser):
+    """Streaming parser for the Netscape bookmark HTML used by every browser export"""
+
+    def __init__(self, importer):
+        super().__init__(convert_charrefs=True)
+        self.importer = importer
+        self.folders = [importer.root_folder]
+        self.pending_folder = None
+        self.link = None
+        self.heading = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            attrs = dict(attrs)
+            self.link = {"url": attrs.get("href") or "", "tags": attrs.get("tags") or "", "title": ""}
+        elif tag == "h3":
+            self.heading = {"title": "", "bar": "personal_toolbar_folder" in dict(attrs)}
+        elif tag == "dl" and self.pending_folder is not None:
+            self.folders.append(self.pending_folder)
+            self.pending_folder = None
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self.link is not None:
+            if self.link["url"].startswith(("http://", "https://", "file://", "ftp://")):
+                self.importer.add_bookmark(self.folders[-1], self.link["title"].strip(),
+                                           self.link["url"], self.link["tags"])
+            self.link = None
+        elif tag == "h3" and self.heading is not None:
+            if self.heading["bar"]:
+                self.pending_folder = self.importer.bar_folder()
+            else:
+                self.pending_folder = self.importer.add_folder(
+                    self.folders[-1], self.heading["title"].strip() or "Untitled")
+            self.heading = None
+        elif tag == "dl" and len(self.folders) > 1:
+            self.folders.pop()
+
+    def handle_data(self, data):
+        if self.link is not None:
+            self.link["title"] += data
+        elif self.heading is not None:
+            self.heading["title"] += data
+
+
+class BookmarkImporter(QThread):
+    """Imports a Netscape HTML or Chromium JSON bookmark export off the GUI thread.
+
+    The file is read in chunks and rows are written in batches through the
+    thread's own SQLite connection, so memory stays flat for very large exports.
+    Everything lands under one "Imported - ..." folder; the export's toolbar
+    entries only move to the Bookmarks Bar once the whole file has been read,
+    so a failed import can be removed completely.
+    """
+
+    progress = pyqtSignal(int, int)  # percent, bookmarks imported
+    failed = pyqtSignal(str)
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, db_path, file_path, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.file_path = file_path
+        self.root_folder = None
+        self.import_bar = None
+        self.error = None
+        self.count = 0
+        self.unflushed = 0
+        self.pending = []
+        self.db = None
+        self.f = None
+        self.total_size = 1
+        self.last_percent = -1
+
+    def run(self):
+        try:
+            self.db = open_bookmarks_db(self.db_path)
+            self.total_size = max(os.path.getsize(self.file_path), 1)
+            with open(self.file_path, "r", encoding="utf-8", errors="replace") as f:
+                self.f = f
+                head = f.read(1024)
+                f.seek(0)
+                name = os.path.splitext(os.path.basename(self.file_path))[0]
+                self.root_folder = self.add_folder(OTHER_FOLDER_ID, f"Imported - {name}")
+                if head.lstrip().startswith("{"):
+                    self.import_chromium(f)
+                else:
+                    self.import_netscape(f)
+            self.flush()
+            self.publish_bar()
+            self.progress.emit(100, self.count)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            self.error = str(e)
+            self.discard_import()
+            self.failed.emit(self.error)
+        finally:
+            if self.db is not None:
+                self.db.close()
+
+    def add_folder(self, parent_id, title):
+        self.flush()
+        cursor = self.db.execute("INSERT INTO folders (parent_id, title) VALUES (?, ?)",
+                                 (parent_id, title))
+        return cursor.lastrowid
+
+    def rename_folder(self, folder_id, title):
+        self.db.execute("UPDATE folders SET title = ? WHERE id = ?", (title, folder_id))
+
+    def bar_folder(self):
+        """Staging folder for the export's toolbar entries"""
+        if self.import_bar is None:
+            self.import_bar = self.add_folder(self.root_folder, "Bookmarks Bar")
+        return self.import_bar
+
+    def publish_bar(self):
+        if self.import_bar is None:
+            return
+        self.db.execute("UPDATE bookmarks SET folder_id = ? WHERE folder_id = ?",
+                        (BAR_FOLDER_ID, self.import_bar))
+        self.db.execute("UPDATE folders SET parent_id = ? WHERE parent_id = ?",
+                        (BAR_FOLDER_ID, self.import_bar))
+        self.db.execute("DELETE FROM folders WHERE id = ?", (self.import_bar,))
+        self.db.commit()
+
+    def discard_import(self):
+        """Remove the partially imported folder tree after a failure"""
+        if self.db is None or self.root_folder is None:
+            return
+        try:
+            self.db.rollback()
+            subtree = ("WITH RECURSIVE tree(id) AS (SELECT ? UNION ALL "
+                       "SELECT folders.id FROM folders JOIN tree ON folders.parent_id = tree.id) ")
+            for statement in (
+                    "DELETE FROM bookmark_tags WHERE bookmark_id IN "
+                    "(SELECT id FROM bookmarks WHERE folder_id IN (SELECT id FROM tree))",
+                    "DELETE FROM bookmarks WHERE folder_id IN (SELECT id FROM tree)",
+                    "DELETE FROM folders WHERE id IN (SELECT id FROM tree)"):
+                self.db.execute(subtree + statement, (self.root_folder,))
+            self.db.commit()
+        except sqlite3.Error:
+            pass
+
+    def add_bookmark(self, folder_id, title, url, tags=""):
+        row = (folder_id, title or url, url, normalize_bookmark_url(url), time.time())
+        tags = clean_tags(tags.split(","))
+        if tags:
+            # Tagged entries need their row id, so they skip the batch; the
+            # batch is written first to keep the export's order
+            self.write_pending()
+            cursor = self.db.execute(
+                "INSERT INTO bookmarks (folder_id, title, url, normalized_url, added) "
+                "VALUES (?, ?, ?, ?, ?)", row)
+            self.db.executemany("INSERT OR IGNORE INTO bookmark_tags (tag, bookmark_id) VALUES (?, ?)",
+                                [(tag, cursor.lastrowid) for tag in tags])
+        else:
+            self.pending.append(row)
+        self.count += 1
+        self.unflushed += 1
+        if self.unflushed >= self.BATCH_SIZE:
+            self.flush()
+
+    def write_pending(self):
+        if self.pending:
+            self.db.executemany(
+                "INSERT INTO bookmarks (folder_id, title, url, normalized_url, added) "
+                "VALUES (?, ?, ?, ?, ?)", self.pending)
+            self.pending = []
+
+    def flush(self):
+        self.write_pending()
+        self.db.commit()
+        self.unflushed = 0
+        self.report_progress()
+
+    def report_progress(self):
+        try:
+            percent = min(99, self.f.tell() * 100 // self.total_size)
+        except (OSError, ValueError):
+            return
+        if percent != self.last_percent:
+            self.last_percent = percent
+            self.progress.emit(percent, self.count)
+
+    def import_netscape(self, f):
+        parser = NetscapeBookmarkParser(self)
+        while True:
+            chunk = f.read(65536)
+            if not chunk:
+                break
+            parser.feed(chunk)
+        parser.close()
+
+    def import_chromium(self, f):
+        roots = {"bookmark_bar": None, "other": self.root_folder, "synced": None}
+        frames = []
+        key = None
+        for event, value in iter_json_events(f):
+            parent = frames[-1] if frames else None
+            if event == "map_key":
+                key = value
+                continue
+
+            if event == "start_map":
+                if parent is None:
+                    frame = {"kind": "top"}
+                elif parent["kind"] == "top" and key == "roots":
+                    frame = {"kind": "roots"}
+                elif parent["kind"] == "roots" and key in roots:
+                    folder = roots[key]
+                    if key == "bookmark_bar":
+                        folder = self.bar_folder()
+                    elif folder is None:
+                        folder = self.add_folder(self.root_folder, "Mobile Bookmarks")
+                    frame = {"kind": "node", "fields": {}, "folder": folder, "root": True}
+                elif parent["kind"] == "children":
+                    frame = {"kind": "node", "fields": {}, "folder": None, "root": False,
+                             "parent_folder": parent["folder"]}
+                else:
+                    frame = {"kind": "skip"}
+                frames.append(frame)
+            elif event == "start_array":
+                if parent is not None and parent["kind"] == "node" and key == "children":
+                    if parent["folder"] is None:
+                        parent["folder"] = self.add_folder(parent["parent_folder"], "")
+                    frames.append({"kind": "children", "folder": parent["folder"]})
+                else:
+                    frames.append({"kind": "skip"})
+            elif event in ("end_map", "end_array"):
+                frame = frames.pop()
+                if frame["kind"] == "node" and not frame["root"]:
+                    self.finish_chromium_node(frame)
+            elif parent is not None and parent["kind"] == "node" and key in ("name", "url", "type"):
+                parent["fields"][key] = value
+            key = None
+
+    def finish_chromium_node(self, frame):
+        fields = frame["fields"]
+        if fields.get("type") == "url" and fields.get("url"):
+            self.add_bookmark(frame["parent_folder"], fields.get("name", ""), fields["url"])
+        elif fields.get("type") == "folder":
+            if frame["folder"] is None:
+                frame["folder"] = self.add_folder(frame["parent_folder"], "")
+            self.rename_folder(frame["folder"], fields.get("name") or "Untitled")
+
+
+class BookmarksBar(QToolBar):
+    """Toolbar showing the contents of the Bookmarks Bar folder"""
+
+    MAX_ITEMS = 50
+
+    def __init__(self, store, open_url, parent=None):
+        super().__init__("Bookmarks", parent)
+        self.store = store
+        self.open_url = open_url
+        self.setMovable(False)
+        self.setStyleSheet("""
+            QToolBar {
+                background-color: #141414;
+                border: none;
+                border-bottom: 1px solid #2D2D2D;
+                padding: 2px 5px;
+                spacing: 4px;
+            }
+            QToolBar QToolButton {
+                background-color: transparent;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                padding: 4px 8px;
+            }
+            QToolBar QToolButton:hover {
+                background-color: #404040;
+            }
+        """)
+        store.changed.connect(self.rebuild)
+        self.rebuild()
+
+    def rebuild(self):
+        self.clear()
+        folders, bookmarks = self.store.folder_children(BAR_FOLDER_ID, self.MAX_ITEMS)
+        for folder_id, title in folders:
+            button = QToolButton(self)
+            button.setText(f"📁 {title}")
+            button.setPopupMode(QToolButton.InstantPopup)
+            button.setMenu(self.folder_menu(folder_id, button))
+            self.addWidget(button)
+        for title, url in bookmarks:
+            action = self.addAction(title[:30])
+            action.setToolTip(url)
+            action.triggered.connect(lambda _, url=url: self.open_url(url))
+
+    def folder_menu(self, folder_id, parent):
+        """Build a menu that only loads its entries when opened"""
+        menu = QMenu(parent)
+        menu.aboutToShow.connect(lambda: self.populate_menu(menu, folder_id))
+        return menu
+
+    def populate_menu(self, menu, folder_id):
+        menu.clear()
+        folders, bookmarks = self.store.folder_children(folder_id)
+        for sub_id, title in folders:
+            menu.addMenu(self.folder_menu(sub_id, menu)).setText(f"📁 {title}")
+        for title, url in bookmarks:
+            action = menu.addAction(title[:60])
+            action.triggered.connect(lambda _, url=url: self.open_url(url))
+        if not folders and not bookmarks:
+            menu.addAction("(empty)").setEnabled(False)
+
+
+class BackgroundJob(QRunnable):
+    """Runs a function on the global thread pool and hands the result to a callback.
+
+    The callback is invoked on the worker thread, so it should only emit a
+    signal of an object living on the GUI thread.
+    """
+
+    def __init__(self, fn, done):
+        super().__init__()
+        self.fn = fn
+        self.done = done
+
+    def run(self):
+        try:
+            result = self.fn()
+        except OSError:
+            result = None
+        self.done(result)
+
+
+def encode_thumbnail(image, width=320, height=200, quality=70):
+    """Downscale a page capture and compress it to JPEG bytes"""
+    scaled = image.scaled(width, height, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+    scaled = scaled.copy((scaled.width() - width) // 2, 0, width, height)
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    scaled.save(buffer, "JPEG", quality)
+    buffer.close()
+    return bytes(data)
+
+
+def read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def write_file(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    return True
+
+
+class ThumbnailCache(QObject):
+    """Size-bounded cache of compressed tab thumbnails.
+
+    Scaling, encoding and disk I/O happen on the thread pool. Thumbnails
+    evicted from memory are spilled to disk and loaded back asynchronously,
+    and only the few thumbnails currently on screen are kept decoded.
+    """
+
+    thumbnailReady = pyqtSignal(int)
+    _jobFinished = pyqtSignal(str, int, object)
+
+    # About one screenful of the overview grid; 320x200 ARGB is 250 KB each,
+    # so decoded pixmaps stay around 6 MB on top of the compressed budget
+    MAX_DECODED = 24
+
+    _instance = None
+
+    def __init__(self, directory, max_bytes=8 * 1024 * 1024, parent=None):
+        super().__init__(parent)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # tab id -> JPEG bytes
+        self.total_bytes = 0
+        self.decoded = OrderedDict()  # tab id -> QPixmap
+        self.on_disk = set()
+        self.loading = set()
+        self.discarded = set()  # closed tabs whose jobs may still be running
+        self.pool = QThreadPool.globalInstance()
+        self._jobFinished.connect(self._job_finished)
+
+        # Tab ids restart every session, so earlier spills are stale
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.endswith(".jpg"):
+                os.remove(os.path.join(directory, name))
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cache_dir = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+            cls._instance = cls(os.path.join(cache_dir, "thumbnails"))
+        return cls._instance
+
+    def _path(self, tab_id):
+        return os.path.join(self.directory, f"{tab_id}.jpg")
+
+    def _submit(self, kind, tab_id, fn):
+        self.pool.start(BackgroundJob(
+            fn, lambda result: self._jobFinished.emit(kind, tab_id, result)))
+
+    def capture(self, tab_id, image):
+        """Queue a full-size page capture (QImage) for downscaling and compression"""
+        if not image.isNull():
+            self._submit("encoded", tab_id, lambda: encode_thumbnail(image))
+
+    def _job_finished(self, kind, tab_id, result):
+        if tab_id in self.discarded:
+            # The tab closed while this job ran; drop its result and any spill
+            if kind == "spilled":
+                try:
+                    os.remove(self._path(tab_id))
+                except OSError:
+                    pass
+            return
+        if kind == "loaded":
+            self.loading.discard(tab_id)
+            # A newer capture may have arrived while the old one was being read
+            if tab_id in self.entries or tab_id not in self.on_disk:
+                return
+        if kind == "spilled" or not result:
+            return
+        self._store(tab_id, result)
+        self.decoded.pop(tab_id, None)
+        self.thumbnailReady.emit(tab_id)
+
+    def _store(self, tab_id, data):
+        old = self.entries.pop(tab_id, None)
+        if old is not None:
+            self.total_bytes -= len(old)
+        self.entries[tab_id] = data
+        self.total_bytes += len(data)
+
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            evicted_id, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= len(evicted)
+            self.decoded.pop(evicted_id, None)
+            self.on_disk.add(evicted_id)
+            self._submit("spilled", evicted_id,
+                         lambda path=self._path(evicted_id), data=evicted: write_file(path, data))
+
+    def pixmap(self, tab_id):
+        """Return the thumbnail for a tab, or None while it is unavailable or loading"""
+        pixmap = self.decoded.get(tab_id)
+        if pixmap is not None:
+            self.decoded.move_to_end(tab_id)
+            return pixmap
+
+        data = self.entries.get(tab_id)
+        if data is not None:
+            self.entries.move_to_end(tab_id)
+            pixmap = QPixmap()
+            pixmap.loadFromData(data, "JPEG")
+            self.decoded[tab_id] = pixmap
+            if len(self.decoded) > self.MAX_DECODED:
+                self.decoded.popitem(last=False)
+            return pixmap
+
+        if tab_id in self.on_disk and tab_id not in self.loading:
+            self.loading.add(tab_id)
+            path = self._path(tab_id)
+            self._submit("loaded", tab_id, lambda: read_file(path))
+        return None
+
+    def discard(self, tab_id):
+        self.discarded.add(tab_id)
+        self.loading.discard(tab_id)
+        data = self.entries.pop(tab_id, None)
+        if data is not None:
+            self.total_bytes -= len(data)
+        self.decoded.pop(tab_id, None)
+        if tab_id in self.on_disk:
+            self.on_disk.discard(tab_id)
+            try:
+                os.remove(self._path(tab_id))
+            except OSError:
+                pass
+
+
+class TabOverviewModel(QAbstractListModel):
+    """Grid model over the open tabs; thumbnails are only decoded when painted"""
+
+    def __init__(self, tabs, thumbnails, parent=None):
+        super().__init__(parent)
+        self.tabs = tabs
+        self.thumbnails = thumbnails
+        self.rows = {tabs.widget(i).tab_id: i for i in range(tabs.count())}
+        self.placeholder = QPixmap(320, 200)
+        self.placeholder.fill(QColor(45, 45, 45))
+        thumbnails.thumbnailReady.connect(self.thumbnail_ready)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.tabs.count()
+
+    def data(self, index, role=Qt.DisplayRole):
+        tab = self.tabs.widget(index.row())
+        if tab is None:
+            return None
+        if role == Qt.DisplayRole:
+            title = tab.browser.page().title() or self.tabs.tabText(index.row())
+            return title if len(title) <= 40 else title[:40] + "..."
+        if role == Qt.DecorationRole:
+            return self.thumbnails.pixmap(tab.tab_id) or self.placeholder
+        if role == Qt.ToolTipRole:
+            return tab.browser.url().toString()
+        return None
+
+    def thumbnail_ready(self, tab_id):
+        row = self.rows.get(tab_id)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+
+class TabOverview(QDialog):
+    """Exposé-style grid of every open tab"""
+
+    def __init__(self, tabs, thumbnails, parent=None):
+        super().__init__(parent)
+        self.tabs = tabs
+        self.setWindowTitle("Tab Overview")
+
+        self.view = QListView()
+        self.view.setViewMode(QListView.IconMode)
+        self.view.setMovement(QListView.Static)
+        self.view.setResizeMode(QListView.Adjust)
+        self.view.setLayoutMode(QListView.Batched)
+        self.view.setBatchSize(50)
+        self.view.setUniformItemSizes(True)
+        self.view.setIconSize(QSize(320, 200))
+        self.view.setGridSize(QSize(340, 240))
+        self.view.setWordWrap(True)
+        self.view.setModel(TabOverviewModel(tabs, thumbnails, self))
+        self.view.setCurrentIndex(self.view.model().index(tabs.currentIndex()))
+        self.view.activated.connect(self.open_tab)
+        self.view.clicked.connect(self.open_tab)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.addWidget(self.view)
+        self.setLayout(layout)
+
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #141414;
+            }
+            QListView {
+                background-color: #141414;
+                color: white;
+                border: none;
+            }
+            QListView::item:selected {
+                background-color: #E50914;
+                border-radius: 4px;
+            }
+            QListView::item:hover:!selected {
+                background-color: #404040;
+                border-radius: 4px;
+            }
+        """)
+
+    def open_tab(self, index):
+        self.tabs.setCurrentIndex(index.row())
+        self.accept()
+
+
+def open_archive_db(path):
+    db = sqlite3.connect(path, timeout=30)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.executescript("""
+        CREATE TABLE IF NOT EXISTS archives (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL,
+            title TEXT NOT NULL,
+            created REAL NOT NULL,
+            last_opened REAL,
+            size INTEGER NOT NULL,
+            boundary BLOB NOT NULL,
+            head BLOB NOT NULL,
+            tail BLOB NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS parts (
+            archive_id INTEGER NOT NULL,
+            seq INTEGER NOT NULL,
+            headers BLOB,
+            blob TEXT NOT NULL,
+            PRIMARY KEY (archive_id, seq)
+        );
+        CREATE TABLE IF NOT EXISTS blobs (
+            hash TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            refs INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS archive_rules (
+            pattern TEXT PRIMARY KEY
+        );
+        CREATE TABLE IF NOT EXISTS archive_settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS archives_url ON archives(url);
+        CREATE INDEX IF NOT EXISTS parts_blob ON parts(blob);
+    """)
+    return db
+
+
+def split_mhtml(data):
+    """Split an MHTML capture into (boundary, head, parts, tail).
+
+    Each part is (headers, body); joining everything back with the boundary
+    delimiter reproduces the original bytes exactly. Part bodies are what get
+    deduplicated, since the same stylesheet or image encodes identically in
+    every capture that contains it.
+    """
+    header_end = data.find(b"\r\n\r\n")
+    match = re.search(rb'boundary="?([^";\r\n]+)"?', data[:header_end if header_end >= 0 else 4096])
+    if match is None:
+        raise ValueError("Not an MHTML document: no multipart boundary")
+    boundary = match.group(1)
+    pieces = data.split(b"--" + boundary)
+    if len(pieces) < 2:
+        raise ValueError("Not an MHTML document: boundary never used")
+
+    parts = []
+    for piece in pieces[1:-1]:
+        split_at = piece.find(b"\r\n\r\n")
+        if split_at < 0:
+            parts.append((None, piece))
+        else:
+            parts.append((piece[:split_at], piece[split_at + 4:]))
+    return boundary, pieces[0], parts, pieces[-1]
+
+
+def join_mhtml(boundary, head, parts, tail):
+    delimiter = b"--" + boundary
+    pieces = [head]
+    for headers, body in parts:
+        pieces.append(body if headers is None else headers + b"\r\n\r\n" + body)
+    pieces.append(tail)
+    return delimiter.join(pieces)
+
+
+class ArchiveStorage:
+    """Content-addressed archive store, used from worker threads.
+
+    Every call opens its own SQLite connection so jobs can run on the thread
+    pool. Blobs are named by their SHA-256 and reference counted, so resources
+    shared between captures are kept once on disk.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.db_path = os.path.join(directory, "archive.db")
+        self.objects_dir = os.path.join(directory, "objects")
+        self.open_dir = os.path.join(directory, "open")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.open_dir, exist_ok=True)
+
+    def open_path(self, archive_id):
+        """Where the rebuilt MHTML of an archive is cached for the session"""
+        return os.path.join(self.open_dir, f"{archive_id}.mhtml")
+
+    def blob_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def write_blob(self, db, data):
+        digest = hashlib.sha256(data).hexdigest()
+        cursor = db.execute("UPDATE blobs SET refs = refs + 1 WHERE hash = ?", (digest,))
+        if cursor.rowcount == 0:
+            path = self.blob_path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                write_file(tmp_path, data)
+                os.replace(tmp_path, path)
+            db.execute("INSERT INTO blobs (hash, size, refs) VALUES (?, ?, 1)", (digest, len(data)))
+        return digest
+
+    def ingest(self, mhtml_path, url, title):
+        """Move a freshly saved MHTML file into the store and return its archive id"""
+        data = read_file(mhtml_path)
+        boundary, head, parts, tail = split_mhtml(data)
+
+        db = open_archive_db(self.db_path)
+        try:
+            cursor = db.execute(
+                "INSERT INTO archives (url, title, created, size, boundary, head, tail) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, title or url, time.time(), len(data), boundary, head, tail))
+            archive_id = cursor.lastrowid
+            db.executemany(
+                "INSERT INTO parts (archive_id, seq, headers, blob) VALUES (?, ?, ?, ?)",
+                [(archive_id, seq, headers, self.write_blob(db, body))
+                 for seq, (headers, body) in enumerate(parts)])
+            db.commit()
+            self.enforce_quota(db, keep=archive_id)
+        finally:
+            db.close()
+            os.remove(mhtml_path)
+        return archive_id
+
+    def materialize(self, archive_id):
+        """Rebuild an archive as a single MHTML file that QtWebEngine can open"""
+        target_path = self.open_path(archive_id)
+        db = open_archive_db(self.db_path)
+        try:
+            # Reopening a cached capture is just a timestamp update
+            if os.path.exists(target_path):
+                cursor = db.execute("UPDATE archives SET last_opened = ? WHERE id = ?",
+                                    (time.time(), archive_id))
+                db.commit()
+                return target_path if cursor.rowcount else None
+
+            row = db.execute("SELECT boundary, head, tail FROM archives WHERE id = ?",
+                             (archive_id,)).fetchone()
+            if row is None:
+                return None
+            parts = [(headers, read_file(self.blob_path(digest))) for headers, digest in db.execute(
+                "SELECT headers, blob FROM parts WHERE archive_id = ? ORDER BY seq", (archive_id,))]
+            db.execute("UPDATE archives SET last_opened = ? WHERE id = ?", (time.time(), archive_id))
+            db.commit()
+        finally:
+            db.close()
+
+        # Written under a temporary name so a half-written file is never reused
+        tmp_path = f"{target_path}.{threading.get_ident()}.tmp"
+        write_file(tmp_path, join_mhtml(row[0], row[1], parts, row[2]))
+        os.replace(tmp_path, target_path)
+        return target_path
+
+    def delete(self, db, archive_id):
+        digests = [digest for (digest,) in db.execute(
+            "SELECT blob FROM parts WHERE archive_id = ?", (archive_id,))]
+        db.execute("DELETE FROM parts WHERE archive_id = ?", (archive_id,))
+        db.execute("DELETE FROM archives WHERE id = ?", (archive_id,))
+        try:
+            os.remove(self.open_path(archive_id))
+        except OSError:
+            pass
+        for digest in digests:
+            db.execute("UPDATE blobs SET refs = refs - 1 WHERE hash = ?", (digest,))
+        for digest in set(digests):
+            if db.execute("DELETE FROM blobs WHERE hash = ? AND refs <= 0", (digest,)).rowcount:
+                try:
+                    os.remove(self.blob_path(digest))
+                except OSError:
+                    pass
+        db.commit()
+
+    def delete_archive(self, archive_id):
+        db = open_archive_db(self.db_path)
+        try:
+            self.delete(db, archive_id)
+        finally:
+            db.close()
+        return True
+
+    def set_quota(self, quota):
+        db = open_archive_db(self.db_path)
+        try:
+            db.execute("INSERT OR REPLACE INTO archive_settings (key, value) VALUES ('quota', ?)",
+                       (str(quota),))
+            db.commit()
+            self.enforce_quota(db)
+        finally:
+            db.close()
+        return True
+
+    def set_rules(self, patterns):
+        db = open_archive_db(self.db_path)
+        try:
+            db.execute("DELETE FROM archive_rules")
+            db.executemany("INSERT OR IGNORE INTO archive_rules (pattern) VALUES (?)",
+                           [(p,) for p in patterns])
+            db.commit()
+        finally:
+            db.close()
+        return True
+
+    def enforce_quota(self, db, keep=None):
+        """Evict the least recently used archives until storage fits the quota.
+
+        The archive ``keep`` (a capture just ingested) is never evicted; if it
+        does not fit even on its own it is removed and ValueError is raised.
+        """
+        row = db.execute("SELECT value FROM archive_settings WHERE key = 'quota'").fetchone()
+        quota = int(row[0]) if row else DEFAULT_ARCHIVE_QUOTA
+        if keep is not None:
+            needed = db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM blobs WHERE hash IN "
+                "(SELECT blob FROM parts WHERE archive_id = ?)", (keep,)).fetchone()[0]
+            if needed > quota:
+                self.delete(db, keep)
+                raise ValueError("Page is larger than the offline storage quota")
+        while db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0] > quota:
+            oldest = db.execute(
+                "SELECT id FROM archives WHERE id IS NOT ? "
+                "ORDER BY COALESCE(last_opened, created) LIMIT 1", (keep,)).fetchone()
+            if oldest is None:
+                break
+            self.delete(db, oldest[0])
+
+
+DEFAULT_ARCHIVE_QUOTA = 2 * 1024 * 1024 * 1024
+
+
+class OfflineArchive(QObject):
+    """Saves pages as MHTML through QWebEnginePage.save and files them in ArchiveStorage.
+
+    Anything that writes to the store runs on the thread pool; the GUI-thread
+    connection is only used for reads, which WAL mode never blocks.
+    """
+
+    archivesChanged = pyqtSignal()
+    archived = pyqtSignal(int)
+    failed = pyqtSignal(str)
+    _jobFinished = pyqtSignal(str, object)
+
+    _instance = None
+
+    def __init__(self, directory, parent=None):
+        super().__init__(parent)
+        self.storage = ArchiveStorage(directory)
+        self.db = open_archive_db(self.storage.db_path)
+        self.incoming_dir = os.path.join(directory, "incoming")
+        self.pending = {}  # incoming MHTML path -> (url, title)
+        self.opening = {}  # rebuilt MHTML path -> callback
+        self.pool = QThreadPool.globalInstance()
+        self.rules = [pattern for (pattern,) in self.db.execute("SELECT pattern FROM archive_rules")]
+        self._jobFinished.connect(self._job_finished)
+
+        # Leftovers from an interrupted save or earlier session are discarded
+        for folder in (self.incoming_dir, self.storage.open_dir):
+            os.makedirs(folder, exist_ok=True)
+            for name in os.listdir(folder):
+                os.remove(os.path.join(folder, name))
+
+        QWebEngineProfile.defaultProfile().downloadRequested.connect(self.download_requested)
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            data_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+            cls._instance = cls(os.path.join(data_dir, "offline"))
+        return cls._instance
+
+    def _submit(self, kind, fn):
+        def run():
+            try:
+                return fn()
+            except (ValueError, sqlite3.Error) as e:
+                return e
+        self.pool.start(BackgroundJob(run, lambda result: self._jobFinished.emit(kind, result)))
+
+    def _job_finished(self, kind, result):
+        if result is None or isinstance(result, Exception):
+            self.failed.emit(str(result) if result is not None else "Could not access offline storage")
+        elif kind == "ingested":
+            self.archivesChanged.emit()
+            self.archived.emit(result)
+        elif kind == "changed":
+            self.archivesChanged.emit()
+        elif kind == "opened":
+            callback = self.opening.pop(result, None)
+            if callback is not None:
+                callback(result)
+
+    def save_page(self, page):
+        url = page.url().toString()
+        path = os.path.join(self.incoming_dir, f"{uuid.uuid4().hex}.mhtml")
+        self.pending[path] = (url, page.title())
+        page.save(path, QWebEngineDownloadItem.MimeHtmlSaveFormat)
+
+    def download_requested(self, item):
+        path = item.path()
+        if path not in self.pending:
+            return
+        item.finished.connect(lambda: self.save_finished(item, path))
+        item.accept()
+
+    def save_finished(self, item, path):
+        url, title = self.pending.pop(path)
+        if item.state() != QWebEngineDownloadItem.DownloadCompleted:
+            self.failed.emit(f"Saving {url} for offline failed")
+            return
+        self._submit("ingested", lambda: self.storage.ingest(path, url, title))
+
+    def open_archive(self, archive_id, callback):
+        """Rebuild an archive in the background and pass its MHTML path to callback"""
+        self.opening[self.storage.open_path(archive_id)] = callback
+        self._submit("opened", lambda: self.storage.materialize(archive_id))
+
+    def delete_archive(self, archive_id):
+        self._submit("changed", lambda: self.storage.delete_archive(archive_id))
+
+    def list_archives(self):
+        return self.db.execute(
+            "SELECT id, title, url, created, size FROM archives ORDER BY created DESC").fetchall()
+
+    def storage_usage(self):
+        """Return (archive count, logical bytes, stored bytes after deduplication)"""
+        count, logical = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM archives").fetchone()
+        stored = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        return count, logical, stored
+
+    def quota(self):
+        row = self.db.execute("SELECT value FROM archive_settings WHERE key = 'quota'").fetchone()
+        return int(row[0]) if row else DEFAULT_ARCHIVE_QUOTA
+
+    def set_quota(self, quota):
+        self._submit("changed", lambda: self.storage.set_quota(quota))
+
+    def set_rules(self, patterns):
+        self.rules = [p.strip() for p in patterns if p.strip()]
+        rules = list(self.rules)
+        self._submit("rules", lambda: self.storage.set_rules(rules))
+
+    def should_auto_archive(self, url, min_interval=3600):
+        """True if an auto-archive rule matches and the page was not captured recently"""
+        if not url.startswith(("http://", "https://")):
+            return False
+        if not any(fnmatch.fnmatchcase(url, pattern) for pattern in self.rules):
+            return False
+        if any(pending_url == url for pending_url, _ in self.pending.values()):
+            return False
+        last = self.db.execute("SELECT MAX(created) FROM archives WHERE url = ?", (url,)).fetchone()[0]
+        return last is None or time.time() - last > min_interval
+
+
+class ArchiveBrowser(QDialog):
+    """Lists offline captures and opens them from disk"""
+
+    def __init__(self, archive, open_path, parent=None):
+        super().__init__(parent)
+        self.archive = archive
+        self.open_path = open_path
+        self.setWindowTitle("Offline Archive")
+        self.resize(900, 600)
+
+        self.usage_label = QLabel()
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Title", "URL", "Saved", "Size"])
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.cellDoubleClicked.connect(lambda row, _: self.open_selected())
+
+        open_btn = QPushButton("Open")
+        open_btn.clicked.connect(self.open_selected)
+        delete_btn = QPushButton("Delete")
+        delete_btn.clicked.connect(self.delete_selected)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.usage_label, 1)
+        buttons.addWidget(open_btn)
+        buttons.addWidget(delete_btn)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.table)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #141414;
+                color: white;
+            }
+            QLabel {
+                color: #808080;
+            }
+            QTableWidget {
+                background-color: #141414;
+                color: white;
+                gridline-color: #2D2D2D;
+                border: none;
+            }
+            QHeaderView::section {
+                background-color: #2D2D2D;
+                color: white;
+                border: none;
+                padding: 4px;
+            }
+            QPushButton {
+                background-color: #E50914;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                padding: 6px 12px;
+            }
+            QPushButton:hover {
+                background-color: #F40612;
+            }
+        """)
+
+        archive.archivesChanged.connect(self.refresh)
+        self.refresh()
+
+    def refresh(self):
+        archives = self.archive.list_archives()
+        self.table.setRowCount(len(archives))
+        for row, (archive_id, title, url, created, size) in enumerate(archives):
+            title_item = QTableWidgetItem(title)
+            title_item.setData(Qt.UserRole, archive_id)
+            self.table.setItem(row, 0, title_item)
+            self.table.setItem(row, 1, QTableWidgetItem(url))
+            self.table.setItem(row, 2, QTableWidgetItem(
+                datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M")))
+            self.table.setItem(row, 3, QTableWidgetItem(f"{size / 1024:.0f} KB"))
+
+        count, logical, stored = self.archive.storage_usage()
+        mb = 1024 * 1024
+        self.usage_label.setText(
+            f"{count} archives - {stored / mb:.1f} MB stored of {self.archive.quota() / mb:.0f} MB quota "
+            f"({max(logical - stored, 0) / mb:.1f} MB saved by deduplication)")
+
+    def selected_archive(self):
+        row = self.table.currentRow()
+        if row < 0:
+            return None
+        return self.table.item(row, 0).data(Qt.UserRole)
+
+    def open_selected(self):
+        archive_id = self.selected_archive()
+        if archive_id is not None:
+            self.archive.open_archive(archive_id, self.open_path)
+            self.accept()
+
+    def delete_selected(self):
+        archive_id = self.selected_archive()
+        if archive_id is not None:
+            self.archive.delete_archive(archive_id)
 
 
 class BrowserTab(QWidget):
+    networkLogChanged = pyqtSignal()
+
+    _ids = count(1)
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.tab_id = next(self._ids)
         self.browser = QWebEngineView()
+        self.network_log = RequestRingBuffer()
+        if PageRequestRecorder.supported():
+            self.browser.page().setUrlRequestInterceptor(PageRequestRecorder(self))
 
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
@@ -18,6 +1786,9 @@ class BrowserTab(QWidget):
 
 
 class TabbedBrowser(QMainWindow):
+    # Open windows, kept referenced so windows opened from the menu stay alive
+    windows = []
+
     def __init__(self):
         super().__init__()
         self.urlbar = None
@@ -25,7 +1796,14 @@ class TabbedBrowser(QMainWindow):
         self.current_theme = "netflix"
         self.browser_name = "Bathu Browser"
         self.search_engine = "brave"  # Brave Search as default
+        self.bookmarks = BookmarkStore.instance()
+        self.bookmark_importer = None
+        self.thumbnails = ThumbnailCache.instance()
+        self.offline = OfflineArchive.instance()
+        self.url_classifier = UrlClassifier.instance(get_data_path("url_classifier.json"))
         self.initUI()
+        self.offline.archived.connect(lambda _: self.status.showMessage("Page saved for offline"))
+        self.offline.failed.connect(self.status.showMessage)
 
     def initUI(self):
         # Create navigation toolbar FIRST
@@ -109,12 +1887,24 @@ class TabbedBrowser(QMainWindow):
         """)
         navtb.addWidget(self.urlbar)
 
+        # Bookmark star, reflects whether the current page is bookmarked
+        self.star_btn = QAction("☆", self)
+        self.star_btn.setStatusTip("Bookmark this page")
+        self.star_btn.triggered.connect(self.toggle_bookmark)
+        navtb.addAction(self.star_btn)
+
         # Theme toggle button
         self.theme_btn = QAction("🎬", self)
         self.theme_btn.setStatusTip("Change theme")
         self.theme_btn.triggered.connect(self.toggle_theme)
         navtb.addAction(self.theme_btn)
 
+        # Bookmarks bar below the navigation toolbar
+        self.addToolBarBreak()
+        self.bookmarks_bar = BookmarksBar(self.bookmarks, self.open_bookmark, self)
+        self.addToolBar(self.bookmarks_bar)
+        self.bookmarks.changed.connect(self.update_star)
+
         # Create menu bar
         self.createMenus()
 
@@ -158,8 +1948,27 @@ class TabbedBrowser(QMainWindow):
             }
         """)
         self.tabs.tabCloseRequested.connect(self.close_tab)
+        # Fires before the switch, while the outgoing page is still on screen
+        self.tabs.tabBar().tabBarClicked.connect(
+            lambda i: i != self.tabs.currentIndex() and self.capture_current_thumbnail())
         self.tabs.currentChanged.connect(self.current_tab_changed)
 
+        # Network inspector dock, fed by each tab's own request recorder; the
+        # profile interceptor enforces the block list and injects the timing script
+        self.network_inspector = NetworkInspector(self)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.network_inspector)
+        self.network_inspector.hide()
+        NetworkRequestInterceptor.instance()
+        TabbedBrowser.windows.append(self)
+
+        # Pull queued Resource Timing entries of the visible tab while inspecting
+        self.timing_timer = QTimer(self)
+        self.timing_timer.setInterval(1000)
+        self.timing_timer.timeout.connect(
+            lambda: self.tabs.currentWidget() and self.collect_resource_timing(self.tabs.currentWidget()))
+        self.network_inspector.visibilityChanged.connect(
+            lambda visible: self.timing_timer.start() if visible else self.timing_timer.stop())
+
         # Create initial tab with CUSTOM HOME PAGE
         self.add_new_tab(self.get_netflix_home_page_html(), is_html=True)
 
@@ -551,6 +2360,30 @@ class TabbedBrowser(QMainWindow):
         new_window_action.triggered.connect(self.new_window)
         file_menu.addAction(new_window_action)
 
+        save_offline_action = QAction("Save for Offline", self)
+        save_offline_action.setShortcut("Ctrl+S")
+        save_offline_action.triggered.connect(self.save_for_offline)
+        file_menu.addAction(save_offline_action)
+
+        archive_action = QAction("Offline Archive...", self)
+        archive_action.setShortcut("Ctrl+Shift+O")
+        archive_action.triggered.connect(self.show_archive_browser)
+        file_menu.addAction(archive_action)
+
+        archive_rules_action = QAction("Auto-Archive Rules...", self)
+        archive_rules_action.triggered.connect(self.edit_archive_rules)
+        file_menu.addAction(archive_rules_action)
+
+        archive_quota_action = QAction("Offline Storage Quota...", self)
+        archive_quota_action.triggered.connect(self.edit_archive_quota)
+        file_menu.addAction(archive_quota_action)
+
+        file_menu.addSeparator()
+
+        export_har_action = QAction("Export Network Log (HAR)...", self)
+        export_har_action.triggered.connect(self.export_har)
+        file_menu.addAction(export_har_action)
+
         file_menu.addSeparator()
 
         exit_action = QAction("Exit", self)
@@ -566,6 +2399,52 @@ class TabbedBrowser(QMainWindow):
         dark_mode_action.triggered.connect(self.toggle_theme)
         view_menu.addAction(dark_mode_action)
 
+        bookmarks_bar_action = QAction("Bookmarks Bar", self)
+        bookmarks_bar_action.setShortcut("Ctrl+Shift+B")
+        bookmarks_bar_action.setCheckable(True)
+        bookmarks_bar_action.setChecked(True)
+        bookmarks_bar_action.toggled.connect(self.bookmarks_bar.setVisible)
+        view_menu.addAction(bookmarks_bar_action)
+
+        network_action = QAction("Network Inspector", self)
+        network_action.setShortcut("Ctrl+Shift+I")
+        network_action.triggered.connect(self.toggle_network_inspector)
+        view_menu.addAction(network_action)
+
+        blocked_hosts_action = QAction("Blocked Hosts...", self)
+        blocked_hosts_action.triggered.connect(self.edit_blocked_hosts)
+        view_menu.addAction(blocked_hosts_action)
+
+        intranet_action = QAction("Intranet Hosts...", self)
+        intranet_action.triggered.connect(self.edit_intranet_hosts)
+        view_menu.addAction(intranet_action)
+
+        # Bookmarks menu
+        bookmarks_menu = menubar.addMenu("&Bookmarks")
+
+        bookmark_page_action = QAction("Bookmark This Page", self)
+        bookmark_page_action.setShortcut("Ctrl+B")
+        bookmark_page_action.triggered.connect(self.toggle_bookmark)
+        bookmarks_menu.addAction(bookmark_page_action)
+
+        tag_page_action = QAction("Edit Tags...", self)
+        tag_page_action.triggered.connect(self.edit_bookmark_tags)
+        bookmarks_menu.addAction(tag_page_action)
+
+        bookmarks_menu.addSeparator()
+
+        other_menu = self.bookmarks_bar.folder_menu(OTHER_FOLDER_ID, bookmarks_menu)
+        bookmarks_menu.addMenu(other_menu).setText("Other Bookmarks")
+
+        tags_menu = bookmarks_menu.addMenu("Tags")
+        tags_menu.aboutToShow.connect(lambda: self.populate_tags_menu(tags_menu))
+
+        bookmarks_menu.addSeparator()
+
+        import_action = QAction("Import Bookmarks...", self)
+        import_action.triggered.connect(self.import_bookmarks)
+        bookmarks_menu.addAction(import_action)
+
     def setApplicationStyle(self, theme):
         self.current_theme = theme
 
@@ -618,7 +2497,12 @@ class TabbedBrowser(QMainWindow):
         theme_toggle = QShortcut(QKeySequence("Ctrl+D"), self)
         theme_toggle.activated.connect(self.toggle_theme)
 
+        # Ctrl+Shift+A for the tab overview grid
+        tab_overview = QShortcut(QKeySequence("Ctrl+Shift+A"), self)
+        tab_overview.activated.connect(self.show_tab_overview)
+
     def add_new_tab(self, url=None, label="New Tab", is_html=False):
+        self.capture_current_thumbnail()
         browser_tab = BrowserTab()
         i = self.tabs.addTab(browser_tab, label)
         self.tabs.setCurrentIndex(i)
@@ -626,12 +2510,23 @@ class TabbedBrowser(QMainWindow):
         # Connect signals
         browser_tab.browser.urlChanged.connect(
             lambda q, browser=browser_tab.browser: self.update_urlbar(q, browser))
+        browser_tab.networkLogChanged.connect(
+            lambda tab=browser_tab: tab is self.tabs.currentWidget() and self.network_inspector.schedule_refresh())
         browser_tab.browser.loadFinished.connect(
             lambda _, browser=browser_tab.browser, index=i: self.update_tab_title(browser, index))
         browser_tab.browser.loadStarted.connect(
             lambda: self.status.showMessage("Loading..."))
         browser_tab.browser.loadFinished.connect(
             lambda ok: self.status.showMessage("Ready" if ok else "Load failed"))
+        browser_tab.browser.loadFinished.connect(
+            lambda _, tab=browser_tab: self.collect_resource_timing(tab))
+        browser_tab.browser.loadFinished.connect(
+            lambda ok, tab=browser_tab: ok and self.auto_archive(tab))
+        browser_tab.browser.loadFinished.connect(
+            lambda ok, browser=browser_tab.browser: ok and self.url_classifier.remember_host(browser.url().toString()))
+        # Give the page a moment to paint before capturing its thumbnail
+        browser_tab.browser.loadFinished.connect(
+            lambda _, tab=browser_tab: QTimer.singleShot(500, lambda: self.capture_thumbnail(tab)))
 
         if is_html:
             # Load custom HTML content
@@ -647,17 +2542,17 @@ class TabbedBrowser(QMainWindow):
 
     def close_tab(self, i):
         if self.tabs.count() > 1:
+            self.thumbnails.discard(self.tabs.widget(i).tab_id)
             self.tabs.removeTab(i)
 
     def close_current_tab(self):
-        current_index = self.tabs.currentIndex()
-        if self.tabs.count() > 1:
-            self.tabs.removeTab(current_index)
+        self.close_tab(self.tabs.currentIndex())
 
     def current_tab_changed(self, i):
         if i >= 0 and self.urlbar is not None:
             current_browser = self.tabs.widget(i).browser
             self.update_urlbar(current_browser.url(), current_browser)
+            self.network_inspector.set_log(self.tabs.widget(i).network_log)
 
     def get_current_browser(self):
         if self.tabs.currentWidget() is not None:
@@ -697,12 +2592,12 @@ class TabbedBrowser(QMainWindow):
         if not url:
             return
 
-        if not url.startswith(('http://', 'https://', 'file://')):
-            if '.' in url and ' ' not in url:
-                url = 'https://' + url
-            else:
-                # Use Brave Search
-                url = self.get_search_url(url)
+        kind, target = self.url_classifier.classify(url)
+        if kind == "url":
+            url = target
+        else:
+            # Use Brave Search
+            url = self.get_search_url(target)
 
         browser.setUrl(QUrl(url))
 
@@ -717,6 +2612,7 @@ class TabbedBrowser(QMainWindow):
             else:
                 self.urlbar.setText(current_url)
                 self.urlbar.setCursorPosition(0)
+            self.update_star()
 
     def update_tab_title(self, browser, index):
         title = browser.page().title()
@@ -738,6 +2634,209 @@ class TabbedBrowser(QMainWindow):
         if index == self.tabs.currentIndex():
             self.setWindowTitle(f"{display_title} - {self.browser_name}")
 
+    def collect_resource_timing(self, tab):
+        tab.browser.page().runJavaScript(
+            RESOURCE_TIMING_TAKE_JS, QWebEngineScript.ApplicationWorld,
+            lambda entries, tab=tab: self.apply_resource_timing(tab, entries))
+
+    def apply_resource_timing(self, tab, entries):
+        tab.network_log.merge_timing(entries)
+        if tab is self.tabs.currentWidget():
+            self.network_inspector.schedule_refresh()
+
+    def toggle_network_inspector(self):
+        self.network_inspector.setVisible(not self.network_inspector.isVisible())
+        if self.network_inspector.isVisible():
+            self.network_inspector.refresh()
+
+    def edit_blocked_hosts(self):
+        interceptor = NetworkRequestInterceptor.instance()
+        text, ok = QInputDialog.getMultiLineText(
+            self, "Blocked Hosts",
+            "Requests to these hosts and their subdomains are blocked (one per line):",
+            "\n".join(sorted(interceptor.blocked_hosts)))
+        if ok:
+            interceptor.set_blocked_hosts(text.splitlines())
+
+    def export_har(self):
+        tab = self.tabs.currentWidget()
+        if tab is None:
+            return
+
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Network Log", "network.har", "HAR files (*.har)")
+        if not path:
+            return
+
+        har = tab.network_log.to_har(
+            self.browser_name, tab.browser.url().toString(), tab.browser.page().title())
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(har, f, indent=2)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Network Log", f"Could not write HAR file:\n{e}")
+            return
+
+        self.status.showMessage(f"Exported {len(tab.network_log)} requests to {path}")
+
+    def current_page_url(self):
+        browser = self.get_current_browser()
+        if browser is None:
+            return None
+        url = browser.url().toString()
+        return url if url and url != "about:blank" else None
+
+    def update_star(self):
+        url = self.current_page_url()
+        starred = url is not None and self.bookmarks.is_bookmarked(url)
+        self.star_btn.setText("★" if starred else "☆")
+        self.star_btn.setStatusTip("Remove bookmark" if starred else "Bookmark this page")
+
+    def toggle_bookmark(self):
+        url = self.current_page_url()
+        if url is None:
+            return
+
+        if self.bookmarks.is_bookmarked(url):
+            self.bookmarks.remove_bookmark(url)
+            self.status.showMessage("Bookmark removed")
+        else:
+            self.bookmarks.add_bookmark(url, self.get_current_browser().page().title())
+            self.status.showMessage("Added to Bookmarks Bar")
+
+    def edit_bookmark_tags(self):
+        url = self.current_page_url()
+        if url is None:
+            return
+
+        if not self.bookmarks.is_bookmarked(url):
+            self.bookmarks.add_bookmark(url, self.get_current_browser().page().title())
+
+        text, ok = QInputDialog.getText(
+            self, "Edit Tags", "Tags (comma separated):", QLineEdit.Normal,
+            ", ".join(self.bookmarks.get_tags(url)))
+        if ok:
+            self.bookmarks.set_tags(url, text.split(","))
+
+    def populate_tags_menu(self, menu):
+        menu.clear()
+        tags = self.bookmarks.all_tags()
+        for tag in tags:
+            # Each tag's bookmarks are only looked up when its submenu opens
+            tag_menu = menu.addMenu(f"🏷 {tag}")
+            tag_menu.aboutToShow.connect(
+                lambda tag_menu=tag_menu, tag=tag: self.populate_tag_menu(tag_menu, tag))
+        if not tags:
+            menu.addAction("(no tags)").setEnabled(False)
+
+    def populate_tag_menu(self, menu, tag):
+        menu.clear()
+        for title, url in self.bookmarks.find_by_tag(tag):
+            action = menu.addAction(title[:60])
+            action.triggered.connect(lambda _, url=url: self.open_bookmark(url))
+
+    def open_bookmark(self, url):
+        browser = self.get_current_browser()
+        if browser:
+            browser.setUrl(QUrl(url))
+
+    def import_bookmarks(self):
+        if self.bookmark_importer is not None:
+            self.status.showMessage("A bookmark import is already running")
+            return
+
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Bookmarks", "",
+            "Bookmark exports (*.html *.htm *.json Bookmarks);;All files (*)")
+        if not path:
+            return
+
+        self.bookmark_importer = BookmarkImporter(self.bookmarks.path, path, self)
+        self.bookmark_importer.progress.connect(
+            lambda percent, count: self.status.showMessage(
+                f"Importing bookmarks... {percent}% ({count:,} bookmarks)"))
+        self.bookmark_importer.failed.connect(
+            lambda message: QMessageBox.warning(self, "Import Bookmarks", f"Import failed:\n{message}"))
+        self.bookmark_importer.finished.connect(self.bookmark_import_finished)
+        self.bookmark_importer.start()
+
+    def bookmark_import_finished(self):
+        importer = self.bookmark_importer
+        importer.deleteLater()
+        self.bookmark_importer = None
+        self.bookmarks.reload_index()
+        if importer.error is None:
+            self.status.showMessage(f"Imported {importer.count:,} bookmarks")
+        else:
+            self.status.showMessage("Bookmark import failed")
+
+    def capture_thumbnail(self, tab):
+        """Grab the tab's page and hand it to the thumbnail cache for encoding"""
+        # Hidden views grab blank or stale frames, which would replace a good thumbnail
+        if self.tabs.indexOf(tab) < 0 or not tab.browser.isVisible():
+            return
+        self.thumbnails.capture(tab.tab_id, tab.browser.grab().toImage())
+
+    def capture_current_thumbnail(self):
+        """Capture the current tab before switching away from it"""
+        tab = self.tabs.currentWidget()
+        if tab is not None:
+            self.capture_thumbnail(tab)
+
+    def show_tab_overview(self):
+        self.capture_current_thumbnail()
+
+        overview = TabOverview(self.tabs, self.thumbnails, self)
+        overview.setGeometry(self.geometry())
+        overview.exec_()
+        overview.deleteLater()
+
+    def save_for_offline(self):
+        browser = self.get_current_browser()
+        if browser is None or not self.current_page_url():
+            return
+        self.offline.save_page(browser.page())
+        self.status.showMessage("Saving page for offline...")
+
+    def auto_archive(self, tab):
+        if self.offline.should_auto_archive(tab.browser.url().toString()):
+            self.offline.save_page(tab.browser.page())
+
+    def show_archive_browser(self):
+        archive_browser = ArchiveBrowser(self.offline, self.open_offline_copy, self)
+        archive_browser.exec_()
+        archive_browser.deleteLater()
+
+    def open_offline_copy(self, path):
+        self.add_new_tab(QUrl.fromLocalFile(path).toString())
+
+    def edit_archive_rules(self):
+        text, ok = QInputDialog.getMultiLineText(
+            self, "Auto-Archive Rules",
+            "Pages matching these patterns are saved when visited, at most once an hour per page\n"
+            "(one per line, e.g. https://wiki.corp/*):",
+            "\n".join(self.offline.rules))
+        if ok:
+            self.offline.set_rules(text.splitlines())
+
+    def edit_archive_quota(self):
+        quota_mb, ok = QInputDialog.getInt(
+            self, "Offline Storage Quota", "Maximum offline storage (MB):",
+            self.offline.quota() // (1024 * 1024), 10, 1024 * 1024)
+        if ok:
+            self.offline.set_quota(quota_mb * 1024 * 1024)
+
+    def edit_intranet_hosts(self):
+        text, ok = QInputDialog.getMultiLineText(
+            self, "Intranet Hosts",
+            "Hosts opened directly instead of searched (one per line, *.corp for a whole domain).\n"
+            "*.local, *.internal and *.lan are always included:",
+            "\n".join(sorted(self.url_classifier.intranet_hosts - UrlClassifier.DEFAULT_INTRANET_HOSTS)))
+        if ok:
+            self.url_classifier.intranet_hosts = set(UrlClassifier.DEFAULT_INTRANET_HOSTS) | {
+                line.strip().lower() for line in text.splitlines() if line.strip()}
+            self.url_classifier.save()
+
     def focus_address_bar(self):
         if self.urlbar is not None:
             self.urlbar.selectAll()
@@ -747,6 +2846,14 @@ class TabbedBrowser(QMainWindow):
         new_browser = TabbedBrowser()
         new_browser.show()
 
+    def closeEvent(self, event):
+        self.timing_timer.stop()
+        if self in TabbedBrowser.windows:
+            TabbedBrowser.windows.remove(self)
+        # Free the window so its pages stop running once it is closed
+        self.deleteLater()
+        super().closeEvent(event)
+
 
 def main():
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
@@ -760,6 +2867,7 @@ def main():
 
     window = TabbedBrowser()
     window.show()
+    app.aboutToQuit.connect(UrlClassifier.instance().save)
 
     sys.exit(app.exec_())
 
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from url_classifier import UrlClassifier  # noqa: E402
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "url_classifier_corpus.tsv")
+
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return [tuple(line.rstrip("\n").split("\t")) for line in f
+                if line.strip() and not line.startswith("#")]
+
+
+def make_classifier():
+    classifier = UrlClassifier()
+    classifier.intranet_hosts.update({"wiki", "*.corp"})
+    classifier.known_hosts["buildbox:8000"] = "http"
+    return classifier
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return make_classifier()
+
+
+@pytest.mark.parametrize("text,expected", load_corpus())
+def test_corpus(classifier, text, expected):
+    assert classifier.classify(text)[0] == expected
+
+
+def test_url_gets_scheme(classifier):
+    assert classifier.classify("example.com") == ("url", "https://example.com")
+    assert classifier.classify("localhost:8080") == ("url", "http://localhost:8080")
+
+
+def test_search_keeps_query(classifier):
+    assert classifier.classify("  node.js  ") == ("search", "node.js")
+
+
+def test_remember_host():
+    classifier = make_classifier()
+    assert classifier.classify("devbox")[0] == "search"
+    classifier.remember_host("https://devbox/index.html")
+    assert classifier.classify("devbox") == ("url", "https://devbox")
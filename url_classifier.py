@@ -0,0 +1,208 @@
+"""Address bar input classification: URL to open or text to search for."""
+import ipaddress
+import json
+import os
+import re
+import zlib
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+
+PUBLIC_SUFFIX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "public_suffix_list.bin")
+PUBLIC_SUFFIX_MAGIC = b"PSL1"
+
+
+def compile_public_suffix_list(source_path, target_path=PUBLIC_SUFFIX_PATH):
+    """Compile the ICANN section of public_suffix_list.dat (https://publicsuffix.org,
+    MPL 2.0) to the compact form read by UrlClassifier: a magic header
+    followed by the zlib-compressed, sorted, punycode rules one per line.
+    """
+    rules = set()
+    in_icann = False
+    with open(source_path, encoding="utf-8") as f:
+        for line in f:
+            # Private suffixes (github.io, blogspot.com, ...) are real sites
+            # people type, so only the ICANN section decides registrability
+            if "===BEGIN ICANN DOMAINS===" in line:
+                in_icann = True
+            elif "===END ICANN DOMAINS===" in line:
+                in_icann = False
+            rule = line.split()[0] if line.strip() else ""
+            if not in_icann or not rule or rule.startswith("//"):
+                continue
+            prefix = "!" if rule.startswith("!") else ""
+            labels = rule.lstrip("!").split(".")
+            rules.add(prefix + ".".join(
+                label if label == "*" else label.encode("idna").decode("ascii") for label in labels))
+    with open(target_path, "wb") as f:
+        f.write(PUBLIC_SUFFIX_MAGIC + zlib.compress("\n".join(sorted(rules)).encode("ascii"), 9))
+    return len(rules)
+
+
+def load_public_suffix_list(path=PUBLIC_SUFFIX_PATH):
+    """Return (rules, wildcards, exceptions) as sets of dotted suffixes"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(PUBLIC_SUFFIX_MAGIC):
+        raise ValueError(f"{path} is not a compiled public suffix list")
+    rules, wildcards, exceptions = set(), set(), set()
+    for rule in zlib.decompress(data[len(PUBLIC_SUFFIX_MAGIC):]).decode("ascii").split("\n"):
+        if rule.startswith("!"):
+            exceptions.add(rule[1:])
+        elif rule.startswith("*."):
+            wildcards.add(rule[2:])
+        else:
+            rules.add(rule)
+    return rules, wildcards, exceptions
+
+
+class UrlClassifier:
+    """Decides whether address bar input is a URL to open or a search query.
+
+    Public hostnames must have a registrable domain under the public suffix
+    list, so "config.yaml" or "node.js" go to search while "example.co.uk"
+    opens. IP addresses, localhost, explicit ports, allowlisted intranet
+    hosts (.local, .internal and .lan by default) and hosts that have loaded
+    before are treated as URLs as well.
+    Every check is a handful of set lookups.
+    """
+
+    SCHEMES = ("http://", "https://", "file://", "ftp://", "about:", "data:", "view-source:", "mailto:")
+    HOST_RE = re.compile(
+        r"^(?:(?P<host>\[[0-9a-fA-F:.]+\]|[^\s/:?#\[\]@]+)(?::(?P<port>\d{1,5}))?)(?P<rest>[/?#]\S*)?$")
+    # "_" is not valid in hostnames but shows up in real DNS names
+    LABEL_RE = re.compile(r"^(?!-)[a-z0-9_-]{1,63}(?<!-)$")
+    DEFAULT_INTRANET_HOSTS = frozenset({"*.local", "*.internal", "*.lan"})
+    MAX_KNOWN_HOSTS = 5000
+
+    _instance = None
+
+    def __init__(self, state_path=None, suffix_path=PUBLIC_SUFFIX_PATH):
+        self.state_path = state_path
+        self.suffix_path = suffix_path
+        self._suffixes = None
+        self.intranet_hosts = set(self.DEFAULT_INTRANET_HOSTS)
+        self.known_hosts = OrderedDict()  # host -> scheme it loaded with
+        if state_path and os.path.exists(state_path):
+            try:
+                with open(state_path, encoding="utf-8") as f:
+                    state = json.load(f)
+                self.intranet_hosts.update(state.get("intranet_hosts", []))
+                self.known_hosts.update(state.get("known_hosts", {}))
+            except (OSError, ValueError):
+                pass
+
+    @classmethod
+    def instance(cls, state_path=None):
+        """Shared classifier for every browser window"""
+        if cls._instance is None:
+            cls._instance = cls(state_path)
+        return cls._instance
+
+    def save(self):
+        if not self.state_path:
+            return
+        try:
+            with open(self.state_path, "w", encoding="utf-8") as f:
+                json.dump({"intranet_hosts": sorted(self.intranet_hosts),
+                           "known_hosts": self.known_hosts}, f)
+        except OSError:
+            pass
+
+    @property
+    def suffixes(self):
+        # Decompressed on first use so startup does not pay for it
+        if self._suffixes is None:
+            try:
+                self._suffixes = load_public_suffix_list(self.suffix_path)
+            except (OSError, ValueError, zlib.error):
+                self._suffixes = (set(), set(), set())
+        return self._suffixes
+
+    def public_suffix_length(self, labels):
+        """Number of trailing labels forming the public suffix, 0 if the TLD is unknown"""
+        rules, wildcards, exceptions = self.suffixes
+        for i in range(len(labels)):
+            suffix = ".".join(labels[i:])
+            if suffix in exceptions:
+                return len(labels) - i - 1
+            if i > 0 and suffix in wildcards:
+                return len(labels) - i + 1
+            if suffix in rules:
+                return len(labels) - i
+        return 0
+
+    def remember_host(self, url):
+        """Record a host that successfully loaded so it is treated as a URL from now on"""
+        parts = urlsplit(url)
+        try:
+            host, port = parts.hostname, parts.port
+        except ValueError:
+            return
+        if parts.scheme not in ("http", "https") or not host:
+            return
+        key = f"{host}:{port}" if port is not None else host
+        self.known_hosts[key] = parts.scheme
+        self.known_hosts.move_to_end(key)
+        if len(self.known_hosts) > self.MAX_KNOWN_HOSTS:
+            self.known_hosts.popitem(last=False)
+
+    def is_intranet_host(self, host):
+        if host in self.intranet_hosts:
+            return True
+        # "*.corp" style entries allow a whole internal domain
+        labels = host.split(".")
+        return any(f"*.{'.'.join(labels[i:])}" in self.intranet_hosts for i in range(1, len(labels)))
+
+    def classify(self, text):
+        """Return ("url", url) or ("search", query) for address bar input"""
+        text = text.strip()
+        if text.lower().startswith(self.SCHEMES):
+            return "url", text
+        if text.startswith("?"):
+            return "search", text[1:].strip()
+
+        match = self.HOST_RE.match(text)
+        if match is None:
+            return "search", text
+
+        host = match.group("host").lower().rstrip(".")
+        port = match.group("port")
+        if port is not None and not 0 < int(port) < 65536:
+            return "search", text
+
+        if host.startswith("["):
+            try:
+                ipaddress.IPv6Address(host[1:-1])
+            except ValueError:
+                return "search", text
+            return "url", "http://" + text
+
+        known_scheme = self.known_hosts.get(f"{host}:{port}" if port else host)
+        if known_scheme is not None:
+            return "url", f"{known_scheme}://{text}"
+
+        try:
+            ipaddress.IPv4Address(host)
+            return "url", "http://" + text
+        except ValueError:
+            pass
+
+        if not host.isascii():
+            try:
+                host = host.encode("idna").decode("ascii")
+            except UnicodeError:
+                return "search", text
+        labels = host.split(".")
+        if not all(self.LABEL_RE.match(label) for label in labels):
+            return "search", text
+
+        if labels[-1] == "localhost" or self.is_intranet_host(host):
+            return "url", "http://" + text
+        if port is not None and (len(labels) == 1 or not labels[-1].isdigit()):
+            return "url", "http://" + text
+
+        suffix_length = self.public_suffix_length(labels)
+        if 0 < suffix_length < len(labels):
+            return "url", "https://" + text
+        return "search", text